@@ -1,8 +1,12 @@
 import os
 import glob
-import json
-import time
+import re
+import asyncio
 import sys
+import queue
+import threading
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from src.config.config_manager import ConfigManager
 from src.places_engine import PlacesEngine
 from src.sheet_manager.sheet_manager import SheetManager
@@ -14,15 +18,55 @@ from src.llm.llm_engine import LLMEngine
 # Ensure current directory is in path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Separators ignored when matching TARGET_STATES against state folder names
+_SHARD_KEY_RE = re.compile(r"[\W_]+")
+
+
+def _parse_one(fpath):
+    """
+    Parses a single state file (runs in a worker process).
+    Returns (state_name, [(district, cities), ...]) or None if unreadable.
+    """
+    try:
+        with open(fpath, "rb") as f:
+            data = orjson.loads(f.read())
+
+        root_keys = list(data.keys())
+        if not root_keys:
+            return None
+
+        state_name = root_keys[0]
+        root = data[state_name]
+        districts_data = root.get("data", [])
+
+        districts = []
+        for d_node in districts_data:
+            d_name = d_node.get("district", "Unknown")
+            cities = d_node.get("places", [])
+            if cities:
+                districts.append((d_name, cities))
+
+        return state_name, districts
+
+    except Exception as e:
+        print(f"❌ Error reading {fpath}: {e}")
+        return None
+
+
+def _shard_key(name):
+    """Normalises a state / folder name so 'Andhra Pradesh' matches 'andhra_pradesh'."""
+    return _SHARD_KEY_RE.sub("", name.lower())
+
 
 def load_inputs():
     """
-    Loads all JSON state files from 'inputs/states/_.json'.
+    Loads all JSON state files from 'inputs/states/<State>/*.json'.
     Returns a unified list of (State, District, [Cities]) tuples.
     """
     hierarchy = [] # Path to states folder
-    search_path = os.path.join(os.path.dirname(__file__), "inputs", "states", "_", "\*.json")
+    search_path = os.path.join(os.path.dirname(__file__), "inputs", "states", "*", "*.json")
     files = glob.glob(search_path)
+    nested = bool(files)
 
     # Fallback to direct files if any
     if not files:
@@ -35,53 +79,188 @@ def load_inputs():
         print(f"❌ No Input Files found.")
         return [], []
 
+    # ---------------------------------------------------------
+    # SHARDING LOGIC: Filter by TARGET_STATES env var {easy to deploy multiple agent with target states}
+    # ---------------------------------------------------------
+    target_states_env = os.getenv("TARGET_STATES")
+    targets = None
+    if target_states_env:
+        targets = [t.strip().lower() for t in target_states_env.split(",")]
+
+        # With the per-state folder layout, skip other states before reading them.
+        # Only safe once every target has its own folder: a target without one
+        # could live in any unmatched folder, so those are parsed and filtered below.
+        if nested:
+            wanted = {_shard_key(t) for t in targets}
+            folders = {_shard_key(os.path.basename(os.path.dirname(f))) for f in files}
+            unmatched = [t for t in targets if _shard_key(t) not in folders]
+            if unmatched:
+                print(f"📂 No state folder for {', '.join(unmatched)}, parsing all files")
+            else:
+                sharded = [
+                    f for f in files
+                    if _shard_key(os.path.basename(os.path.dirname(f))) in wanted
+                ]
+                print(f"⏭️ Skipping {len(files) - len(sharded)} files outside TARGET_STATES")
+                files = sharded
+    # ---------------------------------------------------------
+
     files.sort()
     print(f"📂 Loading Inputs from {len(files)} files...")
 
-    for fpath in files:
-        try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            root_keys = list(data.keys())
-            if not root_keys:
+    # Parse files in parallel, results come back in file order
+    with ProcessPoolExecutor() as ex:
+        for result in ex.map(_parse_one, files, chunksize=8):
+            if result is None:
                 continue
 
-            state_name = root_keys[0]
-
-            # ---------------------------------------------------------
-            # SHARDING LOGIC: Filter by TARGET_STATES env var {easy to deploy multiple agent with target states}
-            # ---------------------------------------------------------
-            target_states_env = os.getenv("TARGET_STATES")
-            if target_states_env:
-                targets = [t.strip().lower() for t in target_states_env.split(",")]
-                if state_name.lower() not in targets:
-                    print(f"⏭️ Skipping State: {state_name}")
-                    continue
-            # ---------------------------------------------------------
-
-            root = data[state_name]
-            districts_data = root.get("data", [])
+            state_name, districts = result
+            if targets and state_name.lower() not in targets:
+                print(f"⏭️ Skipping State: {state_name}")
+                continue
 
-            for d_node in districts_data:
-                d_name = d_node.get("district", "Unknown")
-                cities = d_node.get("places", [])
-                if cities:
-                    hierarchy.append((state_name, d_name, cities))
-
-        except Exception as e:
-            print(f"❌ Error reading {fpath}: {e}")
+            for d_name, cities in districts:
+                hierarchy.append((state_name, d_name, cities))
 
     # Load Categories
     cat_path = os.path.join(os.path.dirname(__file__), "inputs", "categories.json")
     try:
-        with open(cat_path, "r", encoding="utf-8") as f:
-            categories = json.load(f)
+        with open(cat_path, "rb") as f:
+            categories = orjson.loads(f.read())
     except:
         categories = ["Gym", "Spa", "Restaurant"] # Fallback
 
     return hierarchy, categories
 
+def work_items(hierarchy, categories):
+    """
+    Flattens the (state, district, cities) hierarchy into a single stream
+    of (state, district, city, category) work items.
+    """
+    for state, district, cities in hierarchy:
+        print(f"\n🏗️  Starting District: {district}, {state} ({len(cities)} cities)")
+        for city in cities:
+            for category in categories:
+                yield state, district, city, category
+
+def _write_state(sheets, bufs, state, flush=False):
+    """
+    Sends everything buffered for `state` to that state's sheet, then
+    force-flushes when `flush` is set. Returns False if anything failed.
+    Rows that never reached SheetManager go back into `bufs`; rows it
+    accepted stay in its own buffer and are retried on the next flush.
+    """
+    ok = True
+    records = bufs.pop(state, None)
+    if records:
+        try:
+            # Ensure we are logged into the correct State Sheet (Auto-Switch)
+            sheets.switch_to_state_sheet(state)
+        except Exception as e:
+            bufs[state] = records
+            print(f"❌ Could not open sheet for {state}, keeping {len(records)} rows: {e}")
+            return False
+        ok = sheets.append_data(records)
+
+    if flush:
+        ok = sheets.flush(force=True) and ok
+    return ok
+
+def _sheet_writer(sheets, q, batch_size=500):
+    """
+    Single consumer thread that owns all Sheets I/O.
+    Drains (state, district, results) items from `q` into one buffer per
+    state, so interleaved states never force tiny writes. A state's buffer
+    is written once it reaches `batch_size`, and flushed when a
+    (state, district, None) marker says that district is finished.
+    Stops on a `None` sentinel.
+    """
+    bufs = {}
+    while True:
+        item = q.get()
+        try:
+            if item is None:
+                break
+
+            state, district, results = item
+            if results is None:
+                # One batched write per district
+                if _write_state(sheets, bufs, state, flush=True):
+                    print(f"💾 District saved: {district}, {state}")
+                else:
+                    print(f"⚠️ District not fully saved: {district}, {state} (rows kept for retry)")
+                continue
+
+            buf = bufs.setdefault(state, [])
+            buf.extend(results)
+            if len(buf) >= batch_size:
+                _write_state(sheets, bufs, state)
+        except Exception as e:
+            print(f"❌ Sheet Writer Error: {e}")
+        finally:
+            q.task_done()
+
+    # Shutdown: last chance for anything still buffered
+    ok = True
+    for state in list(bufs):
+        ok = _write_state(sheets, bufs, state) and ok
+    if not (sheets.flush(force=True) and ok):
+        print("❌ Some rows could not be saved to Sheets before shutdown.")
+
+async def _fetch_worker(places, sem, items, q, remaining):
+    """
+    Pulls work items from the shared generator until it is exhausted and
+    pushes each fetched result list onto the writer queue.
+    The put runs in a thread so a full queue never stalls the event loop.
+    The worker finishing a district's last item queues its flush marker.
+    """
+    for state, district, city, category in items:
+        try:
+            results = await places.fetch_for_city_category(sem, city, category)
+        except Exception as e:
+            print(f"    ❌ {category} in {city} failed: {e}")
+            results = None
+
+        if results:
+            # Save
+            await asyncio.to_thread(q.put, (state, district, results))
+            print(f"    ✅ Queued {len(results)} rows for {category} in {city}.")
+
+        # Every other item of this district was queued before its count
+        # dropped, so the marker always lands behind the district's rows
+        remaining[(state, district)] -= 1
+        if remaining[(state, district)] == 0:
+            await asyncio.to_thread(q.put, (state, district, None))
+
+async def run(places, sheets, hierarchy, categories, concurrency=20):
+    """
+    Runs a pool of fetch workers over the flattened work items on one
+    event loop, so the Serper connection pool stays warm for the whole run.
+    The semaphore bounds how many Serper requests are in flight at once.
+    """
+    # Bounded so a slow Sheets writer applies backpressure to the fetchers
+    q = queue.Queue(maxsize=1_000)
+    writer = threading.Thread(target=_sheet_writer, args=(sheets, q), daemon=True)
+    writer.start()
+
+    items = work_items(hierarchy, categories)
+    sem = asyncio.BoundedSemaphore(concurrency)
+
+    # Unfinished work items per district, for the district flush markers
+    remaining = {}
+    for state, district, cities in hierarchy:
+        key = (state, district)
+        remaining[key] = remaining.get(key, 0) + len(cities) * len(categories)
+
+    try:
+        await asyncio.gather(
+            *(_fetch_worker(places, sem, items, q, remaining) for _ in range(concurrency))
+        )
+    finally:
+        await asyncio.to_thread(q.put, None)
+        await asyncio.to_thread(writer.join)
+        await places.close()
+
 def main():
     print("🚀 Starting Indian Business Scraper Agent...")
 
@@ -110,28 +289,7 @@ def main():
     print(f"📖 Resuming from District Index: {p_dist_idx}")
 
     # 3. Main Loop
-    for state, district, cities in hierarchy:
-
-        # Ensure we are logged into the correct State Sheet (Auto-Switch)
-        sheets.switch_to_state_sheet(state)
-
-        print(f"\n🏗️  Starting District: {district}, {state} ({len(cities)} cities)")
-
-        for city in cities:
-            print(f"  🏙️  City: {city}")
-
-            for category in categories:
-                print(f"    🔍 Category: {category}")
-
-                # Fetch
-                results = places.fetch_for_city_category(city, category)
-
-                if results:
-                    # Save
-                    sheets.append_data(results)
-                    print(f"    ✅ Saved {len(results)} rows.")
-
-                time.sleep(1) # Polite delay
+    asyncio.run(run(places, sheets, hierarchy, categories))
 
 
 if __name__ == "__main__":
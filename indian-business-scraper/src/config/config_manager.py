@@ -23,6 +23,9 @@ class ConfigManager:
         self.resend_api_key = os.getenv("RESEND_API_KEY")
         self.admin_email = os.getenv("ADMIN_EMAIL")  # Required for sharing
 
+        # Serper response cache lifetime (seconds)
+        self.places_cache_ttl = int(os.getenv("PLACES_CACHE_TTL", 7 * 86400))
+
         # Feature Flags
         self.enable_llm = os.getenv("ENABLE_LLM", "False").lower() == "true"
 
@@ -1,8 +1,9 @@
-from datetime import datetime
+import base64
 import os
 from fpdf import FPDF
 import resend
 from src.config.config_manager import ConfigManager
+from src.timestamps import minute_stamp
 
 class Notifier:
     """
@@ -33,7 +34,7 @@ class Notifier:
         <ul>
             <li><b>Total New Records:</b> {total_records}</li>
             <li><b>Cities Processed:</b> {len(city_stats)}</li>
-            <li><b>Timestamp:</b> {datetime.now().strftime('%Y-%m-%d %H:%M')}</li>
+            <li><b>Timestamp:</b> {minute_stamp('%Y-%m-%d %H:%M')}</li>
         </ul>
         <p>Please find the detailed statistical report attached.</p>
         <br>
@@ -68,25 +69,22 @@ class Notifier:
         pdf.cell(200, 10, txt=f"District Report: {district}, {state}", ln=1, align="C")
         pdf.ln(10)
 
-        # Stats Table
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(60, 10, "City", 1)
-        pdf.cell(80, 10, "Category", 1)
-        pdf.cell(40, 10, "Count", 1)
-        pdf.ln()
+        # Stats Table (fpdf2 lays out widths and borders once for all rows)
+        rows = [
+            (city, cat, str(count))
+            for city, cats in city_stats.items()
+            for cat, count in cats.items()
+        ]
 
         pdf.set_font("Arial", size=12)
-
-        for city, cats in city_stats.items():
-            for cat, count in cats.items():
-                pdf.cell(60, 10, city, 1)
-                pdf.cell(80, 10, cat, 1)
-                pdf.cell(40, 10, str(count), 1)
-                pdf.ln()
+        with pdf.table(width=180, col_widths=(60, 80, 40), text_align="LEFT") as table:
+            table.row(("City", "Category", "Count"))
+            for row in rows:
+                table.row(row)
 
         # Save
         filename = (
-            f"logs/Report_{district}_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
+            f"logs/Report_{district}_{minute_stamp('%Y%m%d_%H%M')}.pdf"
         )
         os.makedirs("logs", exist_ok=True)
         pdf.output(filename)
@@ -111,7 +109,8 @@ class Notifier:
                 params["attachments"].append(
                     {
                         "filename": os.path.basename(path),
-                        "content": list(content),
+                        "content": base64.b64encode(content).decode("ascii"),
+                        "content_type": "application/pdf",
                     }
                 )
 
@@ -1,8 +1,8 @@
-import json
+import orjson
 import os
 import gspread
-from datetime import datetime
 from src.sheet_manager.sheet_manager import SheetManager
+from src.timestamps import minute_stamp
 
 class PersistenceManager:
     """
@@ -16,29 +16,34 @@ class PersistenceManager:
     def __init__(self, sheet_manager):
         self.sheet_manager = sheet_manager
         self.worksheet_name = "System_Memory"
+        self._ws = None
         self._init_memory()
 
     def _init_memory(self):
         """Ensures the memory tab exists."""
+        spreadsheet = self.sheet_manager.client.open_by_url(self.sheet_manager.sheet_url)
         try:
             # Try to get the tab
-            ws = self.sheet_manager.client.open_by_url(
-                self.sheet_manager.sheet_url
-            ).worksheet(self.worksheet_name)
+            self._ws = spreadsheet.worksheet(self.worksheet_name)
         except gspread.WorksheetNotFound:
             # Create it
-            ws = self.sheet_manager.client.open_by_url(
-                self.sheet_manager.sheet_url
-            ).add_worksheet(self.worksheet_name, 10, 5)
-            ws.append_row(["KEY", "VALUE", "LAST_UPDATED", "DESCRIPTION"])
+            self._ws = spreadsheet.add_worksheet(self.worksheet_name, 10, 5)
+            self._ws.append_row(["KEY", "VALUE", "LAST_UPDATED", "DESCRIPTION"])
             # Initialize default rows
             self.save_progress(0, 0, 0, 0)
 
+    def _worksheet(self):
+        """Returns the cached memory tab handle, reopening it if it was dropped."""
+        if self._ws is None:
+            self._ws = self.sheet_manager.client.open_by_url(
+                self.sheet_manager.sheet_url
+            ).worksheet(self.worksheet_name)
+        return self._ws
+
     def save_progress(self, state_idx, dist_idx, city_idx, cat_idx):
         """
         Saves indices to the sheet.
-        We just overwrite row 2 with the JSON blob or specific columns.
-        Let's use a JSON blob in Cell B2 for simplicity.
+        Row 2 is written in a single request: key, JSON blob, timestamp, description.
         """
         data = {
             "state_idx": state_idx,
@@ -48,27 +53,38 @@ class PersistenceManager:
         }
 
         try:
-            ws = self.sheet_manager.client.open_by_url(
-                self.sheet_manager.sheet_url
-            ).worksheet(self.worksheet_name)
-            # Update Cell B2 (Value)
-            ws.update_acell("A2", "CURRENT_PROGRESS")
-            ws.update_acell("B2", json.dumps(data))
-            ws.update_acell("C2", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-            ws.update_acell("D2", "Tracks where the agent stopped")
+            ws = self._worksheet()
+            ws.batch_update(
+                [
+                    {
+                        "range": "A2:D2",
+                        "values": [
+                            [
+                                "CURRENT_PROGRESS",
+                                orjson.dumps(data).decode(),
+                                minute_stamp("%Y-%m-%d %H:%M:00"),
+                                "Tracks where the agent stopped",
+                            ]
+                        ],
+                    }
+                ]
+            )
         except Exception as e:
+            if isinstance(e, gspread.exceptions.APIError):
+                # Handle may be stale, rebuild it on the next call
+                self._ws = None
             print(f"⚠️ Persistence Save Failed: {e}")
 
     def load_progress(self):
         try:
-            ws = self.sheet_manager.client.open_by_url(
-                self.sheet_manager.sheet_url
-            ).worksheet(self.worksheet_name)
+            ws = self._worksheet()
             val = ws.acell("B2").value
             if val:
-                return json.loads(val)
+                return orjson.loads(val)
             else:
                 return {"state_idx": 0, "dist_idx": 0, "city_idx": 0, "cat_idx": 0}
         except Exception as e:
+            if isinstance(e, gspread.exceptions.APIError):
+                self._ws = None
             print(f"⚠️ Persistence Load Failed (Defaulting to 0): {e}")
             return {"state_idx": 0, "dist_idx": 0, "city_idx": 0, "cat_idx": 0}
@@ -1,78 +1,186 @@
-import requests
+import asyncio
+import orjson
+import random
 import time
-import json
+import aiohttp
 from src.config.config_manager import ConfigManager
+from src.serper_cache import SerperCache
 
 class PlacesEngine:
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
         self.base_url = "https://google.serper.dev/places"
+        self.api_key = self.config.get_serper_key()
+        self.headers = {
+            'X-API-KEY': self.api_key,
+            'Content-Type': 'application/json'
+        }
+        self.max_retries = 5
+        self.cache = SerperCache(ttl=self.config.places_cache_ttl)
+
+        # Earliest time (epoch seconds) the next request may go out,
+        # pushed forward when Serper reports the rate limit is exhausted.
+        self._next_allowed_ts = 0.0
 
-    def fetch_for_city_category(self, city, category):
+        self._session = None
+
+    async def _get_session(self):
         """
-        Fetches business data for a given Category in a City using Serper API.
-        Uses 2 query variations for efficiency.
+        Returns the engine's pooled aiohttp session, creating it on first use.
+        Kept open for the whole run so TCP/TLS connections are reused.
         """
-        api_key = self.config.get_serper_key()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=10)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=15),
+                headers=self.headers,
+            )
+        return self._session
 
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self.cache.close()
+
+    async def fetch_for_city_category(self, sem, city, category):
+        """
+        Fetches business data for a given Category in a City using Serper API.
+        Uses 2 query variations for efficiency, fetched concurrently.
+        """
         # 1. Generate Query Variations
         queries = [
             f"{category} in {city} best",
             f"{category} in {city} near market",
         ]
 
-        all_places = {}
+        responses = await asyncio.gather(
+            *(self._afetch(q, sem) for q in queries)
+        )
+
+        # Auth / bad request errors abort the whole pair
+        if any(places is None for places in responses):
+            return None
+
+        seen = set()
+        unique_results = []
 
-        for q in queries:
+        # Deduplicate (check the ID before paying for normalisation)
+        for places in responses:
+            for p in places:
+                pid = p.get("cid") or p.get("place_id")
+                if not pid:
+                    # Tuple key avoids building a concatenated string per place
+                    title_addr = (p.get("title", ""), p.get("address", ""))
+                    pid = title_addr if any(title_addr) else None
+                if pid and pid not in seen:
+                    seen.add(pid)
+                    unique_results.append(self._normalize_place(p, city, category))
+
+        print(f"✅ Found {len(unique_results)} unique places for '{category}' in '{city}'.")
+        return unique_results
+
+    async def _afetch(self, q, sem):
+        """
+        Runs a single Serper query. The semaphore caps in-flight requests.
+        Returns the list of places, or None on an auth / bad request error.
+        """
+        # Serve repeat queries from disk
+        cache_key = self.cache.make_key(q)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"💾 Cache hit: '{q}'")
+            return orjson.loads(cached).get("places", [])
+
+        payload = orjson.dumps({"q": q})
+        session = await self._get_session()
+
+        async with sem:
             print(f"🔎 Searching: '{q}'...")
 
-            payload = json.dumps({"q": q})
-            headers = {
-                'X-API-KEY': api_key,
-                'Content-Type': 'application/json'
-            }
+            for attempt in range(self.max_retries):
+                # Honour the rate limit window reported by earlier responses
+                wait = self._next_allowed_ts - time.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
 
-            try:
-                response = requests.post(self.base_url, headers=headers, data=payload)
+                try:
+                    async with session.post(self.base_url, data=payload) as response:
+                        self._track_rate_limit(response.headers)
 
-                # Check for 403/400 explicitly
-                if response.status_code in [403, 401, 400]:
-                    print(f"❌ API Error {response.status_code}: {response.text}")
-                    return None
+                        # Check for 403/400 explicitly
+                        if response.status in [403, 401, 400]:
+                            print(f"❌ API Error {response.status}: {await response.text()}")
+                            return None
 
-                data = response.json()
-                places = data.get("places", [])
+                        # Throttled or server side failure -> retry with backoff
+                        if response.status == 429 or response.status >= 500:
+                            print(f"   ⏳ API {response.status} for '{q}' (attempt {attempt + 1}/{self.max_retries})")
+                            if attempt < self.max_retries - 1:
+                                await self._backoff(attempt)
+                            continue
 
-                if not places:
-                    print(f"   ⚠️ No results for '{q}'")
+                        body = await response.read()
+                        data = orjson.loads(body)
+                        # Only successful responses are worth replaying
+                        if response.status == 200:
+                            self.cache.set(cache_key, body)
+                        break
 
-                # Deduplicate
-                for p in places:
-                    pid = p.get("cid") or p.get("place_id") or (p.get("title", "") + p.get("address", ""))
-                    if pid and pid not in all_places:
-                        all_places[pid] = self._normalize_place(p, city, category)
+                except Exception as e:
+                    print(f"❌ Network Error: {e}")
+                    if attempt < self.max_retries - 1:
+                        await self._backoff(attempt)
+            else:
+                print(f"❌ Giving up on '{q}' after {self.max_retries} attempts.")
+                return []
 
-            except Exception as e:
-                print(f"❌ Network Error: {e}")
-                time.sleep(2)
+        places = data.get("places", [])
+        if not places:
+            print(f"   ⚠️ No results for '{q}'")
+        return places
 
-        unique_results = list(all_places.values())
-        print(f"✅ Found {len(unique_results)} unique places for '{category}' in '{city}'.")
-        return unique_results
+    def _track_rate_limit(self, headers):
+        """
+        Reads X-RateLimit-Remaining/Reset and, once the quota is used up,
+        blocks further requests until the window resets.
+        """
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+
+        try:
+            if int(float(remaining)) > 0:
+                return
+            reset = float(reset)
+        except ValueError:
+            return
+
+        # Reset may be an epoch timestamp or a delay in seconds
+        reset_ts = reset if reset > 1_000_000_000 else time.time() + reset
+        self._next_allowed_ts = max(self._next_allowed_ts, reset_ts)
+
+    async def _backoff(self, attempt):
+        """Exponential backoff with jitter, capped at 30s."""
+        await asyncio.sleep(min(2 ** attempt, 30) + random.random())
 
     def _normalize_place(self, p, city, category):
         """
         Standardizes the Serper result into our 11-column format.
         """
+        g = p.get
+        website = g("website", "")
         return {
-            "NAME": p.get("title", ""),
+            "NAME": g("title", ""),
             "CATEGORY": category,
-            "ADDRESS": p.get("address", ""),
+            "ADDRESS": g("address", ""),
             "CITY": city,
             "STATE": "",  # To be filled by LLM or inferred
-            "PHONE": p.get("phoneNumber", ""),
-            "WEBSITE": p.get("website", ""),
-            "HASWEBSITE": "Yes" if p.get("website") else "No",
-            "RATING": p.get("rating", 0),
+            "PHONE": g("phoneNumber", ""),
+            "WEBSITE": website,
+            "HASWEBSITE": "Yes" if website else "No",
+            "RATING": g("rating", 0),
             "DATASOURCE": "Serper/GoogleMaps"
         }
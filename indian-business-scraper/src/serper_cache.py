@@ -0,0 +1,62 @@
+import hashlib
+import os
+import sqlite3
+import time
+from src.timestamps import minute_stamp
+
+
+class SerperCache:
+    """
+    Persistent on-disk cache of raw Serper responses.
+
+    Keys are (query, day-bucket) so a crashed/restarted run on the same day
+    replays its queries from disk instead of paying for them again.
+    Entries older than the TTL are purged on startup.
+
+    Runs on the event loop, so writes stay cheap: WAL with synchronous=NORMAL
+    (no fsync per commit) and commits batched every `commit_every` sets.
+    Call `close()` at shutdown to commit the tail.
+    """
+
+    def __init__(self, path="cache/serper.sqlite3", ttl=7 * 86400, commit_every=50):
+        self.ttl = ttl
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, body BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self.conn.commit()
+
+    def make_key(self, query):
+        day = minute_stamp("%Y%m%d")
+        return hashlib.blake2b(f"{query}|{day}".encode()).hexdigest()
+
+    def get(self, key):
+        """Returns the cached raw JSON bytes, or None on a miss / expired entry."""
+        row = self.conn.execute(
+            "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key, body):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, expires_at) VALUES (?, ?, ?)",
+            (key, body, time.time() + self.ttl),
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
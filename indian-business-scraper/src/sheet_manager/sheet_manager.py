@@ -1,11 +1,15 @@
 import time
-import json
+import orjson
 import os
+import re
 import gspread
 from datetime import datetime
 from google.oauth2.service_account import Credentials
 from src.config.config_manager import ConfigManager
 
+# Anything that isn't a letter/digit becomes '_' in sheet titles
+_SAFE_NAME_RE = re.compile(r"\W")
+
 
 class SheetManager:
     """
@@ -36,6 +40,18 @@ class SheetManager:
             "DATASOURCE",
         ]
 
+        # Write buffer: (spreadsheet id, worksheet name) -> (spreadsheet, pending records).
+        # Rows stay tied to the sheet they were buffered for, even across state switches.
+        self._pending = {}
+        self.flush_threshold = 500
+
+        # Cached SR_NO counters: (spreadsheet id, worksheet title) -> rows used
+        self._row_counts = {}
+
+        # Cached handles: state name -> Spreadsheet, (spreadsheet id, title) -> Worksheet
+        self._sheet_cache = {}
+        self._worksheet_cache = {}
+
         self._authenticate()
 
     def _authenticate(self):
@@ -47,22 +63,22 @@ class SheetManager:
             if self.creds_json:
                 print("🔑 Authenticating via GOOGLE_CREDENTIALS_JSON env var...")
                 try:
-                    creds_dict = json.loads(self.creds_json)
+                    creds_dict = orjson.loads(self.creds_json)
                     # Fix: Handle escaped newlines in private_key if loaded from env
                     if "private_key" in creds_dict:
                         pk = creds_dict["private_key"]
                         if "\\n" in pk:
                             creds_dict["private_key"] = pk.replace("\\n", "\n")
 
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     print("❌ Error: GOOGLE_CREDENTIALS_JSON is not valid JSON.")
 
             # 2. Fallback to File
             if not creds_dict:
                 if os.path.exists(self.creds_path):
                     print(f"📂 Authenticating via file: {self.creds_path}")
-                    with open(self.creds_path, "r") as f:
-                        creds_dict = json.load(f)
+                    with open(self.creds_path, "rb") as f:
+                        creds_dict = orjson.loads(f.read())
                 else:
                     raise FileNotFoundError(
                         "No valid Credentials found (Checked Env and File)."
@@ -83,29 +99,62 @@ class SheetManager:
 
     def append_data(self, data: list, worksheet_name: str = "Dataset") -> bool:
         """
-        Appends a list of dictionaries to the active sheet.
-        Handles Serial Number generation automatically.
+        Buffers a list of dictionaries for the active sheet.
+        Rows are only sent once the buffer reaches `flush_threshold`,
+        call `flush(force=True)` at the end of a district.
         """
         if not data:
             return True
 
+        spreadsheet = self.current_spreadsheet
+        key = (spreadsheet.id if spreadsheet is not None else None, worksheet_name)
+        self._pending.setdefault(key, (spreadsheet, []))[1].extend(data)
+        return self.flush()
+
+    def flush(self, force: bool = False) -> bool:
+        """
+        Writes buffered records in one batch per worksheet.
+        Without `force`, does nothing until the buffer is large enough.
+        Batches that fail to write stay buffered.
+        """
+        pending = sum(len(records) for _, records in self._pending.values())
+        if not pending or (not force and pending < self.flush_threshold):
+            return True
+
+        written = {
+            key: self._write_rows(records, key[1], spreadsheet)
+            for key, (spreadsheet, records) in self._pending.items()
+        }
+        # Keep failed batches buffered, the next flush / state switch retries them
+        self._pending = {
+            n: r for n, r in self._pending.items() if not written[n]
+        }
+        return all(written.values())
+
+    def _write_rows(self, data: list, worksheet_name: str, spreadsheet=None) -> bool:
+        """
+        Appends a list of dictionaries to the active sheet.
+        Handles Serial Number generation automatically.
+        """
         try:
-            # Connect
-            if self.current_spreadsheet:
-                spreadsheet = self.current_spreadsheet
-            elif "docs.google.com" in self.sheet_url:
-                spreadsheet = self.client.open_by_url(self.sheet_url)
-            else:
-                spreadsheet = self.client.open_by_key(self.sheet_url)
+            # Connect (buffered rows carry the sheet they were queued for)
+            if spreadsheet is None:
+                if self.current_spreadsheet:
+                    spreadsheet = self.current_spreadsheet
+                elif "docs.google.com" in self.sheet_url:
+                    spreadsheet = self.client.open_by_url(self.sheet_url)
+                else:
+                    spreadsheet = self.client.open_by_key(self.sheet_url)
 
             # Get Active Worksheet (Auto-Rolling)
             ws = self._get_active_worksheet(spreadsheet, worksheet_name)
 
             # Calculate SR_NO
-            existing_rows = len(ws.col_values(1))
+            count_key = (spreadsheet.id, ws.title)
+            existing_rows = self._count_rows(spreadsheet, ws)
             start_id = existing_rows
             if existing_rows == 0:
-                ws.append_row(self.expected_columns)
+                ws.append_row(self.expected_columns, value_input_option="RAW")
                 start_id = 1
                 self._format_header(ws)
 
@@ -113,11 +162,18 @@ class SheetManager:
             rows_to_add = []
             for i, record in enumerate(data):
                 record["SR_NO"] = start_id + i
-                row = [str(record.get(col, "")) for col in self.expected_columns]
+                # Native types (SR_NO, RATING stay numeric), stored as-is
+                row = [record.get(col, "") for col in self.expected_columns]
                 rows_to_add.append(row)
 
             # Batch Append
-            ws.append_rows(rows_to_add)
+            ws.append_rows(
+                rows_to_add,
+                value_input_option="RAW",
+                insert_data_option="INSERT_ROWS",
+                table_range="A1",
+            )
+            self._row_counts[count_key] = start_id + len(rows_to_add)
             print(
                 f"📤 Sheets Manager: Appended {len(rows_to_add)} rows to '{ws.title}'."
             )
@@ -125,6 +181,9 @@ class SheetManager:
 
         except Exception as e:
             print(f"❌ Sheet Append Error: {e}")
+            # Counter / handles may be stale now, re-read them on the next write
+            self._row_counts.clear()
+            self._worksheet_cache.clear()
             return False
 
     def switch_to_state_sheet(self, state_name: str):
@@ -136,18 +195,28 @@ class SheetManager:
         if not self.client:
             self._authenticate()
 
-        safe_name = "".join(c if c.isalnum() else "_" for c in state_name)
+        # Rows buffered for the previous state belong to its sheet
+        self.flush(force=True)
+
+        # Already opened during this run, no Drive lookup needed
+        if state_name in self._sheet_cache:
+            self.current_spreadsheet = self._sheet_cache[state_name]
+            return
+
+        safe_name = _SAFE_NAME_RE.sub("_", state_name)
         sheet_title = f"IBD_{safe_name}"
 
         try:
             print(f"🔄 Switching to Sheet: {sheet_title}...")
             self.current_spreadsheet = self.client.open(sheet_title)
+            self._sheet_cache[state_name] = self.current_spreadsheet
             print(f"✅ Loaded existing sheet: {sheet_title}")
 
         except gspread.SpreadsheetNotFound:
             print(f"🆕 Creating NEW Sheet: {sheet_title}")
             try:
                 self.current_spreadsheet = self.client.create(sheet_title)
+                self._sheet_cache[state_name] = self.current_spreadsheet
                 if self.config.admin_email:
                     print(f"🤝 Sharing {sheet_title} with {self.config.admin_email}...")
                     self.current_spreadsheet.share(
@@ -174,12 +243,21 @@ class SheetManager:
         while True:
             target_name = base_name if i == 1 else f"{base_name}_{i}"
 
+            ws_key = (spreadsheet.id, target_name)
+
             try:
-                ws = spreadsheet.worksheet(target_name)
-                if ws.row_count < 490000:
-                    return ws
+                ws = self._worksheet_cache.get(ws_key)
+                if ws is None:
+                    ws = spreadsheet.worksheet(target_name)
+                    self._worksheet_cache[ws_key] = ws
+
+                # A cached handle's row_count goes stale, prefer our own counter
+                existing_rows = self._row_counts.get(ws_key)
+                if existing_rows is None:
+                    if ws.row_count < 490000:
+                        return ws
+                    existing_rows = self._count_rows(spreadsheet, ws)
 
-                existing_rows = len(ws.col_values(1))
                 if existing_rows < 490000:
                     return ws
 
@@ -191,10 +269,24 @@ class SheetManager:
             except gspread.WorksheetNotFound:
                 print(f"🆕 Creating New Worksheet: '{target_name}'")
                 ws = spreadsheet.add_worksheet(title=target_name, rows=1000, cols=20)
-                ws.append_row(self.expected_columns)
+                ws.append_row(self.expected_columns, value_input_option="RAW")
                 self._format_header(ws)
+                self._worksheet_cache[ws_key] = ws
+                self._row_counts[ws_key] = 1
                 return ws
 
+    def _count_rows(self, spreadsheet, ws) -> int:
+        """
+        Returns the number of used rows in column A.
+        The column is fetched once per worksheet, afterwards the cached
+        counter is advanced locally by `_write_rows`.
+        """
+        count_key = (spreadsheet.id, ws.title)
+        if count_key not in self._row_counts:
+            values = ws.get("A:A", value_render_option="UNFORMATTED_VALUE")
+            self._row_counts[count_key] = len(values)
+        return self._row_counts[count_key]
+
     def _format_header(self, ws):
         try:
             ws.format("A1:K1", {"textFormat": {"bold": True}})
@@ -0,0 +1,19 @@
+import time
+
+# fmt -> (epoch minute, formatted text)
+_cache = {}
+
+
+def minute_stamp(fmt):
+    """
+    Formats the current local time with `fmt`, memoised per minute.
+    Only for formats no finer than minutes (no %S).
+    """
+    minute = int(time.time()) // 60
+    hit = _cache.get(fmt)
+    if hit is not None and hit[0] == minute:
+        return hit[1]
+
+    text = time.strftime(fmt)
+    _cache[fmt] = (minute, text)
+    return text